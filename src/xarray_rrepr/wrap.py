@@ -15,15 +15,17 @@ Core Representation and Sampling Functions
 These functions form the core engine for creating and manipulating the
 minimised representations.
 
-rrepr(obj, size=2, seed=None)
+rrepr(obj, size=2, seed=None, *, contiguous=True, format=False, copy=False)
     The main public function to generate the minimised, random string
-    representation for a given xarray Dataset or DataArray.
+    representation for a given xarray Dataset or DataArray. Optionally formats
+    the code with ``ruff`` and copies it to the clipboard (both opt-in).
 
-random_sample_xarray_obj(obj, size, seed=None)
+random_sample_xarray_obj(obj, size, seed=None, *, contiguous=True)
     Generates a new, smaller xarray object by randomly sampling from each dimension.
 
-random_sample_dims(obj, size, seed=None)
-    Calculates random sampling indices from dimensions of given sizes.
+random_sample_dims(obj, size, seed=None, *, contiguous=True)
+    Calculates random sampling indices from dimensions of given sizes, as a
+    mapping of dimension names to indices.
 
 Deparsing and Formatting Utilities
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -32,12 +34,15 @@ These utilities handle the conversion of xarray objects into valid Python
 code strings and the final formatting of the output.
 
 deparse_xarray_variable(var)
-    Converts a dictionary representing an xarray Variable into a ``repr`` string.
+    Converts an xarray Variable into a ``repr`` string.
     Formatted as a valid Python code snippet (e.g., ``"var": (dims, data)``)
 
 deparse_xarray_variables(vars)
-    Converts a dictionary representing an xarray Dataset (``xarray.Dataset.to_dict()``)
-    into a ``repr`` string representations.
+    Converts a mapping of xarray Variables (``xarray.Dataset.variables``)
+    into a ``repr`` string of a dictionary.
+
+deparse_numpy_array(arr)
+    Converts a numpy array into a ``np.array(...)`` code string.
 
 xarray_rrepr_template(xarray_type, data, coords)
     Formats the final, complete string for the minimised xarray object,
@@ -50,7 +55,9 @@ Utility for ensuring consistent code style in the generated output.
 
 ruff_format(code_string)
     Applies code formatting (using the `ruff` formatter) to a generated
-    code string to ensure consistent style.
+    code string to ensure consistent style. The formatter runs in-process when
+    the optional ``ruff-api`` bindings are installed and falls back to the
+    ``ruff`` executable otherwise.
 
 The typical workflow is to patch the representations at the beginning of a
 session or script to see simplified outputs.
@@ -77,48 +84,54 @@ new, minimised representation.
 ... )
 
 >>> # The output will be a much smaller, random sample of the dataset
->>> print(rrepr(large_ds, seed=42))
+>>> print(rrepr(large_ds, seed=42, format=True))
 xr.Dataset(
     {
         "temperature": (
             ("time", "lat", "lon"),
-            np.array([[[0.9, 1.0], [1.0, 0.3]], [[0.3, 0.8], [0.6, 0.9]]]),
+            np.array([[[0.1, 0.1], [0.9, 1.0]], [[0.2, 0.1], [0.3, 0.1]]]),
         ),
         "pressure": (
             ("time", "lat", "lon"),
-            np.array([[[0.4, 0.4], [0.8, 1.0]], [[0.1, 0.9], [0.2, 0.4]]]),
+            np.array([[[0.7, 1.0], [0.1, 0.5]], [[0.3, 0.9], [0.0, 0.2]]]),
         ),
     },
     coords={
         "time": (
             ("time",),
             np.array(
-                [
-                    datetime.datetime(2020, 3, 9, 0, 0),
-                    datetime.datetime(2020, 1, 11, 0, 0),
-                ],
-                dtype=object,
+                ["2020-01-09T00:00:00", "2020-01-10T00:00:00"],
+                dtype="datetime64[s]",
             ),
         ),
-        "lat": (("lat",), np.array([-25.6, -54.8])),
-        "lon": (("lon",), np.array([-55.7, 54.7])),
+        "lat": (("lat",), np.array([48.8, 49.8])),
+        "lon": (("lon",), np.array([54.7, 55.7])),
     },
 )
 
 """
 
-import subprocess
+import functools
+from collections.abc import Hashable, Mapping
+from types import ModuleType
 
 import numpy as np
 import xarray as xr
-from numpy.random import MT19937, RandomState, SeedSequence
 from numpy.typing import ArrayLike
-from xarray.core.common import AbstractArray, DataWithCoords
+
+# dtypes numpy infers from Python values, left out of the code for non-empty arrays
+IMPLICIT_DTYPES = (np.dtype(float), np.dtype(int), np.dtype(bool))
 
 
-def rrepr(
-    obj: xr.DataArray | xr.Dataset, size: int = 2, seed: dict | None = None
-) -> None:
+def rrepr(  # noqa: PLR0913
+    obj: xr.DataArray | xr.Dataset,
+    size: int = 2,
+    seed: int | None = None,
+    *,
+    contiguous: bool = True,
+    format: bool = False,  # noqa: A002
+    copy: bool = False,
+) -> str:
     """Generate a minimised and randomised string representation of the object.
 
     This method is designed to be monkey-patched onto `xarray.Dataset` and
@@ -145,6 +158,15 @@ def rrepr(
         Seed for the random number generator to ensure the same minimised
         sample is produced on each call. If ``None`` (default), the
         sampling is non-deterministic.
+    contiguous : bool, default True
+        Sample a contiguous slice from each dimension. If ``False``, distinct
+        random elements are picked from each dimension instead.
+    format : bool, default False
+        Format the generated code with ``ruff`` (see :func:`ruff_format`).
+    copy : bool, default False
+        Also copy the generated code to the clipboard, e.g. to paste it in a
+        test or an issue. Requires the optional ``pyperclip`` dependency
+        (``clipboard`` extra).
 
     Returns
     -------
@@ -156,7 +178,9 @@ def rrepr(
     -----
     This method is intended to be patched as ``__repr__`` or called
     explicitly. When patched as ``__repr__``, it will be used automatically
-    when an object is inspected in an interactive console or printed.
+    when an object is inspected in an interactive console or printed. Leave
+    ``format`` and ``copy`` disabled in that case, as both call out to external
+    tools and slow down interactive use.
 
     For reproducibility of the random sampling, it's recommended to set
     a random seed before calling the method, e.g., ``np.random.seed(0)``.
@@ -183,112 +207,196 @@ def rrepr(
     ... )
 
     >>> # The output will be a much smaller, random sample of the dataset
-    >>> print(rrepr(large_ds, seed=42))
+    >>> print(rrepr(large_ds, seed=42, format=True))
     xr.Dataset(
         {
             "temperature": (
                 ("time", "lat", "lon"),
-                np.array([[[0.9, 1.0], [1.0, 0.3]], [[0.3, 0.8], [0.6, 0.9]]]),
+                np.array([[[0.1, 0.1], [0.9, 1.0]], [[0.2, 0.1], [0.3, 0.1]]]),
             ),
             "pressure": (
                 ("time", "lat", "lon"),
-                np.array([[[0.4, 0.4], [0.8, 1.0]], [[0.1, 0.9], [0.2, 0.4]]]),
+                np.array([[[0.7, 1.0], [0.1, 0.5]], [[0.3, 0.9], [0.0, 0.2]]]),
             ),
         },
         coords={
             "time": (
                 ("time",),
                 np.array(
-                    [
-                        datetime.datetime(2020, 3, 9, 0, 0),
-                        datetime.datetime(2020, 1, 11, 0, 0),
-                    ],
-                    dtype=object,
+                    ["2020-01-09T00:00:00", "2020-01-10T00:00:00"],
+                    dtype="datetime64[s]",
                 ),
             ),
-            "lat": (("lat",), np.array([-25.6, -54.8])),
-            "lon": (("lon",), np.array([-55.7, 54.7])),
+            "lat": (("lat",), np.array([48.8, 49.8])),
+            "lon": (("lon",), np.array([54.7, 55.7])),
         },
     )
 
     """
-    resampled_obj = random_sample_xarray_obj(obj, size=size, seed=seed).to_dict()
-    coords_expr = deparse_xarray_variables(resampled_obj["coords"])
-    if isinstance(obj, xr.DataArray):
+    resampled_obj = random_sample_xarray_obj(
+        obj, size=size, seed=seed, contiguous=contiguous
+    )
+    coords_expr = deparse_xarray_variables(resampled_obj.coords.variables)
+    if isinstance(resampled_obj, xr.DataArray):
         xarray_type = "xr.DataArray"
-        data_expr = round_float_array(resampled_obj["data"])
-    elif isinstance(obj, xr.Dataset):
+        data_expr = deparse_numpy_array(round_float_array(resampled_obj.values))
+    elif isinstance(resampled_obj, xr.Dataset):
         xarray_type = "xr.Dataset"
-        data_expr = deparse_xarray_variables(resampled_obj["data_vars"])
+        data_expr = deparse_xarray_variables(resampled_obj.data_vars.variables)
     else:
         msg = "Unknown data type"
         raise TypeError(msg)
     code_string = xarray_rrepr_template(xarray_type, data_expr, coords_expr)
-    code_string_with_numpy_import = code_string.replace("array", "np.array")
-    return ruff_format(code_string_with_numpy_import)
+    if format:
+        code_string = ruff_format(code_string)
+    if copy:
+        import pyperclip  # noqa: PLC0415
+
+        pyperclip.copy(code_string)
+    return code_string
 
 
 def random_sample_dims(
-    obj: xr.DataArray | xr.Dataset, size: int, seed: int | None
-) -> ArrayLike:
-    """Calculate random sampling indices from dimensions of given sizes."""
-    rng = RandomState(MT19937(SeedSequence(seed)))
-    max_id = np.array(list(obj.sizes.values()))[..., np.newaxis]
-    return rng.randint(max_id, size=(len(obj.sizes), size))
+    obj: xr.DataArray | xr.Dataset,
+    size: int,
+    seed: int | None,
+    *,
+    contiguous: bool = True,
+) -> dict[Hashable, slice | ArrayLike]:
+    """Calculate random sampling indices from dimensions of given sizes.
+
+    The indices of all dimensions are drawn from a single random number
+    generator and returned as a mapping of dimension names to indexers. These
+    are slices of ``size`` contiguous elements starting at a random position, or,
+    when ``contiguous`` is ``False``, sorted arrays of ``size`` distinct random
+    indices.
+    Dimensions no longer than ``size`` are taken whole.
+    """
+    rng = np.random.default_rng(seed)
+    indices = {}
+    # dimensions are few, drawing them one by one avoids building arrays of sizes
+    for dim, dim_size in obj.sizes.items():
+        if dim_size <= size:
+            # nothing to sample, the whole dimension is taken
+            indices[dim] = slice(None)
+        elif contiguous:
+            start = int(rng.integers(dim_size - size + 1))
+            indices[dim] = slice(start, start + size)
+        else:
+            # sorted indices preserve the order and locality of the original data
+            indices[dim] = np.sort(rng.choice(dim_size, size=size, replace=False))
+    return indices
 
 
 def random_sample_xarray_obj(
-    obj: xr.DataArray | xr.Dataset, size: int, seed: int | None = None
+    obj: xr.DataArray | xr.Dataset,
+    size: int,
+    seed: int | None = None,
+    *,
+    contiguous: bool = True,
 ) -> xr.DataArray | xr.Dataset:
     """Generate a new, smaller xarray object by randomly sampling from each
     dimension.
     """  # noqa: D205
-    indices = random_sample_dims(obj=obj, size=size, seed=seed)
-    indices_dict = dict(zip(obj.sizes.keys(), indices, strict=True))
-    return obj.isel(indices_dict)
+    indices = random_sample_dims(obj=obj, size=size, seed=seed, contiguous=contiguous)
+    return obj.isel(indices)
+
+
+def deparse_xarray_variable(variable: xr.Variable) -> str:
+    """Convert an xarray Variable into a ``repr`` string. Formatted as a valid
+    Python code snippet (e.g., ``"var": (dims, data)``).
+    """  # noqa: D205
+    var_data = deparse_numpy_array(round_float_array(variable.values))
+    return f"({variable.dims!r}, {var_data})"
 
 
-def deparse_xarray_variable(variable: dict) -> DataWithCoords:
-    """Convert a dictionary representing an xarray Variable into a ``repr``
-    string. Formatted as a valid Python code snippet (e.g., ``"var":
-    (dims, data)``).
+def deparse_numpy_array(arr: np.ndarray) -> str:
+    """Convert a numpy array into a ``np.array(...)`` code string. The dtype is
+    only included when it can not be inferred from the values (always for empty
+    arrays). All elements are written out, large arrays are not summarised.
     """  # noqa: D205
-    var_data = round_float_array(variable["data"])
-    return (variable["dims"], var_data)
+    data = np.array2string(
+        arr,
+        separator=", ",
+        # floats are written as their shortest round-tripping string, independent of
+        # the user's print options
+        formatter={"float_kind": str},
+        threshold=arr.size + 1,
+    )
+    if arr.size > 0 and arr.dtype in IMPLICIT_DTYPES:
+        return f"np.array({data})"
+    return f"np.array({data}, dtype={str(arr.dtype)!r})"
 
 
-def round_float_array(arr: ArrayLike, ndigits: int = 1) -> ArrayLike:
+def round_float_array(arr: ArrayLike, ndigits: int = 1) -> np.ndarray:
     """Round numpy array with float values."""
-    arr = np.asarray(arr)
-    if np.issubdtype(arr.dtype, np.floating):
-        return np.round(arr, ndigits)
+    if not isinstance(arr, np.ndarray):
+        arr = np.asarray(arr)
+    if arr.dtype.kind == "f":
+        # the method skips the dispatch of np.round, which dominates for tiny arrays
+        return arr.round(ndigits)
     return arr
 
 
-def deparse_xarray_variables(variables: dict) -> DataWithCoords:
-    """Convert a dictionary representing an xarray Dataset
-    (``xarray.Dataset.to_dict()``) into a ``repr`` string representations.
+def deparse_xarray_variables(variables: Mapping[Hashable, xr.Variable]) -> str:
+    """Convert a mapping of xarray Variables (e.g. ``xarray.Dataset.variables``)
+    into a ``repr`` string of a dictionary.
     """  # noqa: D205
-    return {name: deparse_xarray_variable(var) for name, var in variables.items()}
+    items = []
+    # same as deparse_xarray_variable, inlined to save a call per variable
+    for name, variable in variables.items():
+        var_data = deparse_numpy_array(round_float_array(variable.values))
+        items.append(f"{name!r}: ({variable.dims!r}, {var_data})")
+    return f"{{{', '.join(items)}}}"
 
 
-def xarray_rrepr_template(
-    xarray_type: str, data: AbstractArray | DataWithCoords, coords: DataWithCoords
-) -> str:
+def xarray_rrepr_template(xarray_type: str, data: str, coords: str) -> str:
     """Format the final, complete string for the minimised xarray object,
     wrapping it in a template that includes coordinates and data variables.
     """  # noqa: D205
-    return f"{xarray_type}({data!r}, coords={coords!r})"
+    return f"{xarray_type}({data}, coords={coords})"
 
 
+@functools.lru_cache(maxsize=128)
 def ruff_format(code_string: str) -> str:
     """Apply code formatting (using the `ruff` formatter) to a generated
     code string to ensure consistent style.
+
+    Formatting is done in-process with the ``ruff-api`` bindings when available,
+    avoiding the start-up cost of spawning the ``ruff`` executable on every call.
+    Results are cached, as the same code is often formatted repeatedly (e.g. a
+    seeded ``rrepr`` used as ``__repr__``).
     """  # noqa: D205
+    ruff_api = _ruff_api()
+    if ruff_api is None:
+        return _ruff_format_executable(code_string)
+    try:
+        return ruff_api.format_string("rrepr.py", code_string)
+    except ruff_api.RuffError as err:
+        raise RuntimeError(str(err)) from err
+
+
+@functools.cache
+def _ruff_api() -> ModuleType | None:
+    """Import the optional ``ruff-api`` bindings once, ``None`` if not installed."""
+    try:
+        import ruff_api  # noqa: PLC0415
+    except ImportError:
+        return None
+    return ruff_api
+
+
+def _ruff_format_executable(code_string: str) -> str:
+    """Format a code string by piping it through the ``ruff`` executable."""
+    import subprocess  # noqa: PLC0415
+
     result = subprocess.run(
         [  # noqa: S607
             "ruff",
             "format",
+            # ignore any ruff configuration of the working directory, the same as
+            # the bindings, which always format with the default settings
+            "--isolated",
             "-",
         ],
         check=False,
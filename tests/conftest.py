@@ -0,0 +1,11 @@
+import pytest
+import xarray as xr
+
+
+@pytest.fixture(scope="session")
+def air_temperature() -> xr.Dataset:
+    # opening and decoding the tutorial dataset is slow, load it once per session
+    # (once per worker when running in parallel with pytest-xdist, which is opt-in as
+    # the suite is too small to gain from it)
+    return xr.tutorial.load_dataset("air_temperature")
+